@@ -0,0 +1,46 @@
+import os
+import queue
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+import urwid
+
+
+class BackgroundTasks:
+    """Run blocking calls on a thread pool and hand their results back to the
+    thread running the urwid main loop, which is the only place it is safe to
+    touch widgets from.
+    """
+
+    def __init__(self, max_workers: int):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._callbacks: queue.SimpleQueue = queue.SimpleQueue()
+        self._wake_fd: Optional[int] = None
+
+    def attach(self, loop: urwid.MainLoop) -> None:
+        self._wake_fd = loop.watch_pipe(self._run_callbacks)
+        if not self._callbacks.empty():
+            self._wake()
+
+    def submit(self, func: Callable, /, *args, **kwargs) -> Future:
+        return self._pool.submit(func, *args, **kwargs)
+
+    def when_done(self, future: Future, callback: Callable[[Future], None]) -> None:
+        future.add_done_callback(lambda f: self.call_soon(lambda: callback(f)))
+
+    def call_soon(self, callback: Callable[[], None]) -> None:
+        """Run ``callback`` on the main loop's thread. Safe to call from any thread."""
+        self._callbacks.put(callback)
+        self._wake()
+
+    def _wake(self) -> None:
+        if self._wake_fd is not None:
+            os.write(self._wake_fd, b"\n")
+
+    def _run_callbacks(self, _data: bytes) -> bool:
+        while True:
+            try:
+                callback = self._callbacks.get_nowait()
+            except queue.Empty:
+                return True
+            callback()
@@ -0,0 +1,90 @@
+from typing import Callable, Dict
+
+import urwid
+from additional_urwid_widgets import IndicativeListBox
+
+
+class LazyListWalker(urwid.ListWalker):
+    """List walker that only builds the widgets it is asked for.
+
+    Widgets are created by calling ``factory`` with their position the first
+    time that position is requested, and are kept for subsequent requests.
+    """
+
+    def __init__(self, length: int, factory: Callable[[int], urwid.Widget]):
+        self._length = length
+        self._factory = factory
+        self._widgets: Dict[int, urwid.Widget] = {}
+        self.focus = 0
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, position):
+        if not isinstance(position, int) or not 0 <= position < self._length:
+            raise IndexError(f"No widget at position {position}")
+
+        widget = self._widgets.get(position)
+        if widget is None:
+            # IndicativeListBox expects every item to be wrapped in an AttrMap
+            # so that it can highlight the selected item when not in focus.
+            widget = urwid.AttrMap(self._factory(position), None)
+            self._widgets[position] = widget
+        return widget
+
+    def set_length(self, length: int):
+        """Change how many items there are, such as when more have finished loading."""
+        self._length = length
+        if self.focus >= length:
+            self.focus = max(length - 1, 0)
+        self._modified()
+
+    def set_focus(self, position):
+        if not isinstance(position, int) or not 0 <= position < self._length:
+            raise IndexError(f"No widget at position {position}")
+        self.focus = position
+        self._modified()
+
+    def next_position(self, position):
+        if position >= self._length - 1:
+            raise IndexError
+        return position + 1
+
+    def prev_position(self, position):
+        if position <= 0:
+            raise IndexError
+        return position - 1
+
+    def positions(self, reverse=False):
+        if reverse:
+            return range(self._length - 1, -1, -1)
+        return range(self._length)
+
+
+class LazyIndicativeListBox(IndicativeListBox):
+    def __init__(
+        self,
+        walker: LazyListWalker,
+        /,
+        *,
+        position=0,
+        on_selection_change=None,
+        initialization_is_selection_change=False,
+        **kwargs,
+    ):
+        # IndicativeListBox rewrites its body in place during initialisation,
+        # which would build every item. Start out empty and swap in a list box
+        # around the lazy walker afterwards.
+        super().__init__(urwid.SimpleFocusListWalker([]), **kwargs)
+
+        self._listbox = urwid.ListBox(walker)
+        self._w.body = self._listbox
+
+        nearest_valid_position = self._get_nearest_valid_position(position)
+        if nearest_valid_position is not None:
+            self._listbox.set_focus(nearest_valid_position)
+
+        self.on_selection_change = on_selection_change
+        self._initialization_is_selection_change = initialization_is_selection_change
+        if initialization_is_selection_change and on_selection_change is not None:
+            on_selection_change(None, self.get_selected_position())
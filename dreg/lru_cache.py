@@ -0,0 +1,49 @@
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class LRUCache:
+    """Mapping that holds on to at most ``maxsize`` items, discarding the least
+    recently used item whenever a new one would take it over the limit.
+
+    Items for which ``pinned`` returns true are never discarded, even if that
+    means holding on to more than ``maxsize`` items for a while.
+    """
+
+    def __init__(self, maxsize: int, pinned: Optional[Callable[[Any], bool]] = None):
+        self.maxsize = maxsize
+        self._pinned = pinned
+        self._items: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        self._items[key] = value
+        self._items.move_to_end(key)
+        if len(self._items) <= self.maxsize:
+            return
+
+        # Least recently used first.
+        for old_key in list(self._items):
+            if len(self._items) <= self.maxsize:
+                break
+            if self._pinned is None or not self._pinned(self._items[old_key]):
+                del self._items[old_key]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            value = self._items[key]
+        except KeyError:
+            return default
+        self._items.move_to_end(key)
+        return value
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        return self._items.pop(key, default)
+
+    def clear(self) -> None:
+        self._items.clear()
@@ -0,0 +1,234 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from dreg_client.client import CatalogResponse, Client, scope_repo
+from dreg_client.manifest import (
+    ImageConfig,
+    ManifestParseOutput,
+    parse_image_config_blob_response,
+    parse_manifest_response,
+)
+from dreg_client.schemas import schema_2, schema_2_list
+from requests import Response
+from requests_toolbelt.sessions import BaseUrlSession
+
+
+def default_cache_dir() -> str:
+    cache_home = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "dreg-tui")
+
+
+class CachingClient(Client):
+    """Registry client that keeps manifests and image config blobs on disk.
+
+    Both are addressed by their digest and so never change once written. Only
+    lookups by digest are answered from the cache, so tags should first be turned
+    into digests with ``resolve_digest``.
+
+    The catalogue and tag lists are kept on disk too, but only for ``listing_ttl``
+    seconds, or until ``clear_listings`` is called.
+    """
+
+    def __init__(
+        self,
+        session: BaseUrlSession,
+        /,
+        *,
+        cache_dir: str,
+        tag_ttl: float = 30,
+        listing_ttl: float = 3600,
+        **kwargs,
+    ):
+        super().__init__(session, **kwargs)
+
+        # Leave out any credentials in the URL, so they never end up in a directory name.
+        url = urlsplit(session.base_url)
+        host = f"{url.hostname}_{url.port}" if url.port else url.hostname
+        self._cache_dir = os.path.join(cache_dir, host)
+        self._tag_ttl = tag_ttl
+        self._listing_ttl = listing_ttl
+        self._tag_digests: Dict[Tuple[str, str], Tuple[float, str]] = {}
+        self._tag_digests_lock = threading.Lock()
+        # Bumped by clear_listings, so that listings fetched before then are never written.
+        self._listings_generation = 0
+        self._listings_lock = threading.Lock()
+
+    def catalog(self) -> CatalogResponse:
+        return self._cached_listing(self._catalog_path(), super().catalog)
+
+    def iter_repository_tags(self, name: str, /, *, page_size: int = 100) -> Iterator[Sequence[str]]:
+        """Yield a repository's tags a page at a time, as the registry sends them."""
+        path = self._tags_path(name)
+        generation = self._listings_generation
+        listing = self._read_listing(path)
+        if listing is not None:
+            yield listing["tags"] or ()
+            return
+
+        tags = []
+        url_path: Optional[str] = f"{name}/tags/list?n={page_size}"
+        while url_path:
+            response = self._get(url_path, scope_repo(name))
+            page = response.json()["tags"] or ()
+            tags.extend(page)
+            yield page
+
+            # Registries that paginate point at the next page with a Link header.
+            next_link = response.links.get("next")
+            url_path = next_link["url"] if next_link else None
+
+        self._write_listing(path, {"name": name, "tags": tags}, generation)
+
+    def clear_listings(self):
+        with self._tag_digests_lock:
+            self._tag_digests.clear()
+        with self._listings_lock:
+            self._listings_generation += 1
+            try:
+                os.unlink(self._catalog_path())
+            except FileNotFoundError:
+                pass
+            shutil.rmtree(os.path.join(self._cache_dir, "tags"), ignore_errors=True)
+
+    def resolve_digest(self, name: str, tag: str) -> str:
+        """Return the digest that ``tag`` currently points at. The answer is
+        remembered for ``tag_ttl`` seconds.
+        """
+        key = (name, tag)
+        with self._tag_digests_lock:
+            expires_at, digest = self._tag_digests.get(key, (0, None))
+        if digest and expires_at > time.monotonic():
+            return digest
+
+        digest = self.check_manifest(name, tag)
+        if not digest:
+            # Not every registry reports the digest for a HEAD request, so fall back to
+            # fetching the manifest itself. It is cached by digest along the way.
+            digest = self.get_manifest(name, tag).digest
+
+        with self._tag_digests_lock:
+            self._tag_digests[key] = (time.monotonic() + self._tag_ttl, digest)
+        return digest
+
+    def get_manifest(self, name: str, reference: str) -> ManifestParseOutput:
+        # Tags can't contain colons, so this is a digest.
+        if ":" in reference:
+            body = self._read(("manifests", name, reference))
+            if body is not None:
+                content_type = json.loads(body)["mediaType"]
+                return parse_manifest_response(_cached_response(body, reference, content_type))
+
+        headers = {
+            "Accept": ",".join((schema_2, schema_2_list)),
+        }
+        response = self._get(f"{name}/manifests/{reference}", scope_repo(name), headers=headers)
+        manifest = parse_manifest_response(response)
+
+        # Legacy manifests don't carry their media type in the payload, which is needed
+        # to parse them back out of the cache, so only newer ones get written.
+        if manifest.content_type in (schema_2, schema_2_list):
+            self._write(("manifests", name, manifest.digest), response.content)
+
+        return manifest
+
+    def get_image_config_blob(self, name: str, digest: str) -> ImageConfig:
+        body = self._read(("blobs", name, digest))
+        if body is not None:
+            return parse_image_config_blob_response(_cached_response(body, digest))
+
+        response = self.get_blob(name, digest)
+        config = parse_image_config_blob_response(response)
+        self._write(("blobs", name, digest), response.content)
+        return config
+
+    def _cached_listing(self, path: str, fetch):
+        generation = self._listings_generation
+        listing = self._read_listing(path)
+        if listing is not None:
+            return listing
+
+        listing = fetch()
+        self._write_listing(path, listing, generation)
+        return listing
+
+    def _write_listing(self, path: str, listing, generation: int):
+        with self._listings_lock:
+            # A listing that was still being fetched when the listings were cleared
+            # may already be out of date.
+            if generation == self._listings_generation:
+                _write_file(path, json.dumps(listing).encode())
+
+    def _read_listing(self, path: str):
+        try:
+            if os.stat(path).st_mtime + self._listing_ttl > time.time():
+                with open(path, "rb") as f:
+                    return json.load(f)
+        except (OSError, ValueError):
+            pass
+        return None
+
+    def _catalog_path(self) -> str:
+        return os.path.join(self._cache_dir, "catalog.json")
+
+    def _tags_path(self, name: str) -> str:
+        return os.path.join(self._cache_dir, "tags", f"{name}.json")
+
+    def _path(self, key: Tuple[str, str, str]) -> str:
+        kind, name, digest = key
+        algorithm, _sep, encoded = digest.partition(":")
+        return os.path.join(self._cache_dir, kind, name, algorithm, encoded)
+
+    def _read(self, key: Tuple[str, str, str]) -> Optional[bytes]:
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _write(self, key: Tuple[str, str, str], body: bytes):
+        _kind, _name, digest = key
+        algorithm, _sep, encoded = digest.partition(":")
+        # Never trust the cache with something that doesn't match the digest it will be
+        # looked up by.
+        if algorithm != "sha256" or hashlib.sha256(body).hexdigest() != encoded:
+            return
+
+        _write_file(self._path(key), body)
+
+
+def _write_file(path: str, body: bytes):
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        # Write to a temporary file first, so that a crash or a second writer can
+        # never leave a partially written entry behind.
+        fd, temp_path = tempfile.mkstemp(dir=directory)
+    except OSError:
+        # The cache is only an optimisation, so carry on without it.
+        return
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(body)
+        os.replace(temp_path, path)
+    except OSError:
+        os.unlink(temp_path)
+
+
+def _cached_response(body: bytes, digest: str, content_type: Optional[str] = None) -> Response:
+    # The dreg_client parsers read everything they need from a response's headers and
+    # body, so hand them one that looks like it came from the registry.
+    response = Response()
+    response.status_code = 200
+    response._content = body
+    response.headers["Docker-Content-Digest"] = digest
+    response.headers["Content-Length"] = str(len(body))
+    if content_type:
+        response.headers["Content-Type"] = content_type
+    return response
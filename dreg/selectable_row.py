@@ -14,9 +14,6 @@ class BetterSelectableRow(_SelectableRow):
         columns_factory=urwid.Columns,
         column_factory=urwid.Text,
     ):
-        self.contents = contents
-        self.on_select = on_select
-
         column_widgets = []
         for c in contents:
             if isinstance(c, tuple):
@@ -29,6 +26,18 @@ class BetterSelectableRow(_SelectableRow):
                 column = column_factory(c, align=align)
             column_widgets.append(column)
 
+        self._init_columns(
+            contents,
+            column_widgets,
+            on_select=on_select,
+            space_between=space_between,
+            columns_factory=columns_factory,
+        )
+
+    def _init_columns(self, contents, column_widgets, /, *, on_select, space_between, columns_factory):
+        self.contents = contents
+        self.on_select = on_select
+
         self._columns = columns_factory(column_widgets, dividechars=space_between)
 
         super(_SelectableRow, self).__init__(self._columns)
@@ -0,0 +1,17 @@
+import threading
+
+from requests_toolbelt.sessions import BaseUrlSession
+
+
+class ThrottledSession(BaseUrlSession):
+    """Session that lets at most ``max_requests`` requests be in flight at once,
+    however many threads are making them.
+    """
+
+    def __init__(self, base_url: str, /, *, max_requests: int):
+        super().__init__(base_url)
+        self._slots = threading.BoundedSemaphore(max_requests)
+
+    def request(self, *args, **kwargs):
+        with self._slots:
+            return super().request(*args, **kwargs)
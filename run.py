@@ -1,29 +1,35 @@
 from __future__ import annotations
 
-import itertools
+import functools
 import os
 import re
-import weakref
-from typing import Optional
+from operator import attrgetter
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, Union
 
 from dotenv import load_dotenv
-from dreg_client import Platform, PlatformImage, Registry, Repository
-from humanfriendly import format_size as base_format_size
+from dreg_client import Image, ImageHistoryItem, Manifest, Platform, PlatformImage, Registry, Repository
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 import urwid
 from urwid import AttrMap, Columns, Filler, Frame, Pile, SolidFill, Text
 from additional_urwid_widgets import IndicativeListBox
 
+from dreg.background import BackgroundTasks
+from dreg.lazy_list import LazyIndicativeListBox, LazyListWalker
+from dreg.lru_cache import LRUCache
+from dreg.manifest_cache import CachingClient, default_cache_dir
 from dreg.scrollable import Scrollable
 from dreg.selectable_row import BetterSelectableRow
+from dreg.throttled_session import ThrottledSession
 
 
 load_dotenv()
 
-line = urwid.Divider("\N{LOWER ONE QUARTER BLOCK}")
 divider = urwid.Divider()
 
-palette = [
+palette = (
     (None, "light gray", "black"),
     ("heading", "black", "light gray"),
     ("footer", "black", "light gray"),
@@ -33,7 +39,7 @@ palette = [
     ("focus line", "black", "dark red"),
     ("focus options", "black", "light gray"),
     ("selected", "white", "dark blue"),
-]
+)
 focus_map = {
     "heading": "focus heading",
     "footer": "footer",
@@ -41,9 +47,6 @@ focus_map = {
     "line": "focus line",
 }
 
-screen = urwid.raw_display.Screen()
-screen_cols, screen_rows = screen.get_cols_rows()
-
 
 preferred_platform_name = os.getenv("DREG_PREFERRED_PLATFORM")
 preferred_platform: Optional[Platform]
@@ -52,53 +55,176 @@ if preferred_platform_name:
 else:
     preferred_platform = None
 
-dclient = Registry.build_with_manual_client(
-    os.getenv("REGISTRY_URL"),
-    auth=(os.getenv("REGISTRY_USERNAME"), os.getenv("REGISTRY_PASSWORD")),
+# Background fetches and the per-platform fan out can have up to 16 calls going at once.
+# Registries are quick to rate limit, so only let half of them hit the network together.
+registry_session = ThrottledSession(os.getenv("REGISTRY_URL"), max_requests=8)
+registry_session.auth = (os.getenv("REGISTRY_USERNAME"), os.getenv("REGISTRY_PASSWORD"))
+# All background fetches share this session, so keep enough connections open for every
+# worker to reuse one, and back off and retry when the registry starts rate limiting.
+registry_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=(429, 502, 503, 504),
+        raise_on_status=False,
+    ),
+)
+registry_session.mount("http://", registry_adapter)
+registry_session.mount("https://", registry_adapter)
+
+registry_client = CachingClient(
+    registry_session,
+    cache_dir=os.getenv("DREG_CACHE_DIR") or default_cache_dir(),
 )
-dclient.refresh()
+dclient = Registry(registry_client)
+
+background = BackgroundTasks(max_workers=8)
+# Per-platform fetches are fanned out from inside background tasks. Giving them their own
+# pool means a busy background pool can never leave them waiting on each other.
+platform_fetches = ThreadPoolExecutor(max_workers=8)
+
+# Built menus are kept around so that revisiting them doesn't hit the registry again.
+menu_cache = LRUCache(maxsize=64)
+
+# Registry fetches that have been started, either by opening a menu or by prefetching it.
+# Fetches still running are never dropped, so nothing is ever fetched twice at once.
+fetches = LRUCache(maxsize=32, pinned=lambda future: not future.done())
+
+# Bumped whenever the registry is refreshed. Fetches started before then finish as usual,
+# but their results are thrown away instead of being shown or cached.
+registry_generation = 0
 
+# How many repositories to start loading tags for as soon as a namespace is opened.
+PREFETCH_REPOSITORY_COUNT = 16
+# How many tags to start loading platform images for as soon as a repository is opened.
+PREFETCH_TAG_COUNT = 5
+# How long focus has to settle on a menu item before its contents are prefetched, so that
+# scrolling quickly through a list doesn't queue up a fetch for every item passed over.
+PREFETCH_DELAY = 0.15
+prefetch_alarm = None
 
+
+@functools.lru_cache(maxsize=2048)
 def format_size(num_bytes: int) -> str:
     if num_bytes < 1024:
         return f"{num_bytes} B"
+    # Sizes are only needed once a tag has been opened, so keep humanfriendly off the startup path.
+    from humanfriendly import format_size as base_format_size
     return base_format_size(num_bytes, binary=True)
 
 
-def trim_digest(digest: str) -> str:
-    return digest[7:19]
+layer_size = attrgetter("size")
+
+
+@functools.lru_cache(maxsize=512)
+def sum_layer_sizes(manifest: Manifest) -> int:
+    # Manifests hash on their digest, so reopened tags hit the cache.
+    return sum(map(layer_size, manifest.layers))
+
+
+CREATED_BY_LINE_BREAKS = (
+    (re.compile(r"([^ ]) &&  "), r"\1 &&\n  "),
+    (re.compile(r"([^ ])([ ]+)&& "), r"\1\n\2&& "),
+    (re.compile(r"([^& ])( {6,})([^& ])"), r"\1\n\2\3"),
+    (re.compile(r"&&( {3,})([^& ])"), r"&&\n\1\2"),
+)
+
+
+@functools.lru_cache(maxsize=2048)
+def clean_created_by(history_item: ImageHistoryItem) -> str:
+    return history_item.clean_created_by
 
 
+@functools.lru_cache(maxsize=64)
+def build_layer_rows(pimage: PlatformImage) -> tuple[tuple[str, str], ...]:
+    # One pass over the history, pairing each entry's label with the size of
+    # the layer it produced (if any).
+    rows = []
+    layer_idx = 0
+    for history_item in pimage.config.history:
+        if history_item.empty_layer:
+            size = 0
+        else:
+            size = pimage.layers[layer_idx].size
+            layer_idx += 1
+        rows.append((clean_created_by(history_item), format_size(size)))
+    return tuple(rows)
+
+
+@functools.lru_cache(maxsize=2048)
 def format_created_by(created_by: str) -> str:
     if not created_by.startswith("RUN "):
         return created_by
 
-    created_by = re.sub(r"([^ ]) &&  ", r"\1 &&\n  ", created_by)
-    created_by = re.sub(r"([^ ])([ ]+)&& ", r"\1\n\2&& ", created_by)
-    created_by = re.sub(r"([^& ])( {6,})([^& ])", r"\1\n\2\3", created_by)
-    created_by = re.sub(r"&&( {3,})([^& ])", r"&&\n\1\2", created_by)
+    for pattern, replacement in CREATED_BY_LINE_BREAKS:
+        created_by = pattern.sub(replacement, created_by)
     return created_by
 
 
-def cb(func):
-    def wrap(*args, **kwargs):
-        func()
-    return wrap
+def unwrap(widget: urwid.Widget) -> urwid.Widget:
+    try:
+        while True:
+            widget = widget.original_widget
+    except AttributeError:
+        return widget
+
+
+def fetch(key: tuple, func) -> Future:
+    future = fetches.get(key)
+    if future is None or (future.done() and future.exception() is not None):
+        future = background.submit(func)
+        fetches[key] = future
+    return future
+
+
+def schedule_prefetch(walker: urwid.ListWalker):
+    global prefetch_alarm
+    if prefetch_alarm is not None:
+        loop.remove_alarm(prefetch_alarm)
+    prefetch_alarm = loop.set_alarm_in(PREFETCH_DELAY, lambda _loop, _data: prefetch_focus(walker))
+
+
+def prefetch_focus(walker: urwid.ListWalker):
+    global prefetch_alarm
+    prefetch_alarm = None
+
+    widget, _position = walker.get_focus()
+    prefetch = getattr(unwrap(widget), "prefetch", None)
+    if prefetch is not None:
+        prefetch()
+
+
+def make_menu(choices: Union[list[urwid.WidgetWrap], LazyListWalker], **kwargs):
+    if isinstance(choices, LazyListWalker):
+        walker = choices
+        listbox = LazyIndicativeListBox(walker, **kwargs)
+    else:
+        walker = urwid.SimpleFocusListWalker(choices)
+        listbox = IndicativeListBox(walker, **kwargs)
+    urwid.connect_signal(walker, "modified", schedule_prefetch, user_args=[walker])
+    menu = AttrMap(listbox, "options")
+    return menu
 
 
-def unwrap(widget: urwid.Widget) -> urwid.Widget:
-    while isinstance(widget, urwid.WidgetDecoration):
-        widget = widget.original_widget
-    return widget
+# Fixed column widths, including the padding added by row_column_factory. Sizes are
+# at most "1023.99 KiB" long, and digests are trimmed to 12 characters.
+SIZE_COLUMN_WIDTH = 13
+DIGEST_COLUMN_WIDTH = 14
 
 
-def make_menu(choices: list[urwid.WidgetWrap], **kwargs):
-    listbox = IndicativeListBox(
-        urwid.SimpleFocusListWalker(choices),
-        **kwargs,
-    )
-    menu = AttrMap(listbox, "options")
-    return menu
+def row_columns_factory(*args, **kwargs):
+    columns = Columns(*args, **kwargs)
+    return AttrMap(columns, None, "selected")
+
+
+@functools.lru_cache(maxsize=1024)
+def row_column_factory(markup: str, align=urwid.LEFT, wrap=urwid.SPACE) -> urwid.Padding:
+    # Row cells repeat a lot ("0 B", platform names, common RUN lines). urwid is
+    # happy to render the same widget in several places, so hand out one padded
+    # cell per value.
+    return pad_text(Text(markup, align=align, wrap=wrap))
 
 
 class MenuButton(urwid.Button):
@@ -107,46 +233,23 @@ class MenuButton(urwid.Button):
 
         urwid.connect_signal(self, "click", callback)
         self._w = AttrMap(
-            urwid.SelectableIcon([" \N{BULLET} ", caption], 2),
+            urwid.SelectableIcon(f" \N{BULLET} {caption}", 2),
             None,
             "selected",
         )
 
 
 class LayerChoice(BetterSelectableRow):
-    def __init__(self, pimage: PlatformImage, history_idx: int):
-        def columns_factory(*args, **kwargs):
-            columns = Columns(*args, **kwargs)
-            return AttrMap(columns, None, "selected")
-
-        def column_factory(*args, **kwargs):
-            return pad_text(Text(*args, **kwargs))
-
-        history_item = pimage.config.history[history_idx]
-        if history_item.empty_layer:
-            size_str = format_size(0)
-        else:
-            layer_idx = None
-            non_empty_history = filter(lambda item: not item.empty_layer, pimage.config.history)
-            for non_empty_layer_idx, non_empty_history_item in enumerate(non_empty_history):
-                if non_empty_history_item is history_item:
-                    layer_idx = non_empty_layer_idx
-                    break
-
-            if layer_idx is None:
-                raise Exception("Logic failure.")
-
-            relevant_layer = pimage.layers[layer_idx]
-            size_str = format_size(relevant_layer.size)
-
-        super().__init__(
-            (
-                (history_item.clean_created_by, {"width": 27, "wrap": "ellipsis"}),
-                (size_str, {"align": urwid.RIGHT}),
-            ),
+    def __init__(self, pimage: PlatformImage, history_idx: int, label: str, size_str: str):
+        self._init_columns(
+            (label, size_str),
+            [
+                row_column_factory(label, wrap="ellipsis"),
+                (SIZE_COLUMN_WIDTH, row_column_factory(size_str, align=urwid.RIGHT)),
+            ],
+            on_select=None,
             space_between=1,
-            columns_factory=columns_factory,
-            column_factory=column_factory,
+            columns_factory=row_columns_factory,
         )
 
         self.pimage = pimage
@@ -154,29 +257,41 @@ class LayerChoice(BetterSelectableRow):
 
 
 class PlatformChoice(BetterSelectableRow):
-    def __init__(self, pimage: PlatformImage):
-        def columns_factory(*args, **kwargs):
-            columns = Columns(*args, **kwargs)
-            return AttrMap(columns, None, "selected")
-
-        def column_factory(*args, **kwargs):
-            return pad_text(Text(*args, **kwargs))
-
-        super().__init__(
-            (
-                pimage.platform_name,
-                trim_digest(pimage.digest),
-                (format_size(pimage.image_size), {"align": urwid.RIGHT}),
-            ),
-            on_select=cb(self.open_menu),
+    def __init__(self, image: Image, platform: Platform, manifest: Manifest):
+        contents = self.make_contents(platform, manifest)
+        platform_name, digest, size_str = contents
+
+        self._init_columns(
+            contents,
+            [
+                row_column_factory(platform_name),
+                (DIGEST_COLUMN_WIDTH, row_column_factory(digest)),
+                (SIZE_COLUMN_WIDTH, row_column_factory(size_str, align=urwid.RIGHT)),
+            ],
+            on_select=self.open_menu,
             space_between=1,
-            columns_factory=columns_factory,
-            column_factory=column_factory,
+            columns_factory=row_columns_factory,
         )
 
-        self.pimage = pimage
-        self.menu = None
-        self.viewer = None
+        self.image = image
+        self.platform = platform
+        self.manifest = manifest
+        # Only loaded (along with the image config) once the platform is opened.
+        self.pimage: Optional[PlatformImage] = None
+        self._view_cache: dict[int, Text] = {}
+
+    @staticmethod
+    def make_contents(platform: Platform, manifest: Manifest) -> tuple[str, str, str]:
+        return (
+            platform.name,
+            # Drop the "sha256:" prefix and keep the first 12 characters of the hash.
+            manifest.digest[7:19],
+            format_size(sum_layer_sizes(manifest)),
+        )
+
+    @property
+    def menu_cache_key(self) -> tuple:
+        return ("platform", self.manifest.digest)
 
     def _open_menu(self, menu, viewer):
         layer_view_container = Columns([], dividechars=1, focus_column=0)
@@ -191,112 +306,188 @@ class PlatformChoice(BetterSelectableRow):
         display_pile.focus_position = 2
 
     def _make_view_text(self, idx: int) -> Text:
-        history_item = self.pimage.config.history[idx]
-        text = format_created_by(history_item.clean_created_by)
-        return Text(text, wrap=urwid.ANY)
-
-    def open_menu(self):
-        menu = self.menu
-        viewer = self.viewer
-        if menu and viewer:
-            actual_menu = menu()
-            actual_viewer = viewer()
-            if actual_menu and actual_viewer:
-                self._open_menu(actual_menu, actual_viewer)
-                return
+        view_text = self._view_cache.get(idx)
+        if view_text is None:
+            history_item = self.pimage.config.history[idx]
+            text = format_created_by(clean_created_by(history_item))
+            view_text = Text(text, wrap=urwid.ANY)
+            self._view_cache[idx] = view_text
+        return view_text
+
+    def open_menu(self, _widget=None):
+        cached = menu_cache.get(self.menu_cache_key)
+        if cached:
+            self._open_menu(*cached)
+            return
 
-        choices = [LayerChoice(self.pimage, idx) for idx, _ in enumerate(self.pimage.config.history)]
-        actual_menu = make_menu(
-            choices,
-            on_selection_change=self.layer_selection_change,
-            initialization_is_selection_change=True,
-        )
+        placeholder = make_loading_placeholder()
+        layers_frame.body = placeholder
 
-        initial_view = self._make_view_text(0)
-        actual_viewer = Scrollable(initial_view)
+        future = self._fetch_platform_image()
+        background.when_done(future, functools.partial(self._platform_image_loaded, placeholder))
 
-        self.menu = weakref.ref(actual_menu)
-        self.viewer = weakref.ref(actual_viewer)
+    def prefetch(self):
+        if self.menu_cache_key not in menu_cache:
+            self._fetch_platform_image()
 
-        self._open_menu(actual_menu, actual_viewer)
+    def _fetch_platform_image(self) -> Future:
+        # The manifest is on disk by now, so this only costs fetching the image config.
+        load = functools.partial(self.image.get_platform_image, self.platform)
+        return fetch(self.menu_cache_key, load)
 
-    def layer_selection_change(self, _prev_idx, new_idx):
-        viewer = self.viewer
-        if not viewer:
-            return
-        actual_viewer: Optional[Scrollable] = viewer()
-        if not actual_viewer:
+    def _platform_image_loaded(self, placeholder, future: Future):
+        try:
+            self.pimage = future.result()
+        except Exception as e:
+            # Nothing is cached, so opening the platform again retries.
+            if layers_frame.body is placeholder:
+                layers_frame.body = make_error_placeholder(e)
             return
 
-        new_view = self._make_view_text(new_idx)
-        actual_viewer.original_widget = new_view
+        viewer = Scrollable(self._make_view_text(0))
+
+        layer_rows = build_layer_rows(self.pimage)
+        choices = LazyListWalker(
+            len(layer_rows),
+            lambda idx: LayerChoice(self.pimage, idx, *layer_rows[idx]),
+        )
+        menu = make_menu(
+            choices,
+            on_selection_change=functools.partial(self.layer_selection_change, viewer),
+            initialization_is_selection_change=True,
+        )
+
+        menu_cache[self.menu_cache_key] = (menu, viewer)
+
+        if layers_frame.body is placeholder:
+            self._open_menu(menu, viewer)
+
+    def layer_selection_change(self, viewer: Scrollable, _prev_idx, new_idx):
+        viewer.original_widget = self._make_view_text(new_idx)
 
 
 class TagChoice(urwid.WidgetWrap):
     def __init__(self, repo: Repository, tag: str):
         super().__init__(
-            MenuButton(tag, cb(self.open_menu))
+            MenuButton(tag, self.open_menu)
         )
         self.repo = repo
         self.tag = tag
-        self.menu = None
+        # The digest the tag pointed at when it was first loaded, so that reloading it
+        # goes straight to the manifest instead of resolving the tag again.
+        self.digest: Optional[str] = None
 
-    def _open_menu(self, menu):
+    @property
+    def menu_cache_key(self) -> tuple:
+        return ("tag", self.repo.name, self.tag)
+
+    def _show(self, body):
         reset_display()
 
         header: Text = unwrap(display_frame.header)
         header.set_text(f"{self.repo.name} - {self.tag}")
 
-        platforms_frame.body = menu
+        platforms_frame.body = body
+
+    def _open_menu(self, menu):
+        self._show(menu)
 
         container.focus_position = 1
         display_pile.focus_position = 0
 
-    def open_menu(self):
-        menu = self.menu
+    def open_menu(self, _widget=None):
+        menu = menu_cache.get(self.menu_cache_key)
         if menu:
-            actual_menu = menu()
-            if actual_menu:
-                self._open_menu(actual_menu)
-                return
+            self._open_menu(menu)
+            return
+
+        placeholder = make_loading_placeholder()
+        self._show(placeholder)
+
+        future = self._fetch_platform_manifests()
+        background.when_done(
+            future,
+            functools.partial(self._platform_manifests_loaded, registry_generation, placeholder),
+        )
+
+    def prefetch(self):
+        if self.menu_cache_key not in menu_cache:
+            self._fetch_platform_manifests()
+
+    def _fetch_platform_manifests(self) -> Future:
+        return fetch(self.menu_cache_key, self._load_platform_manifests)
 
-        image = self.repo.get_image(self.tag)
+    def _load_platform_manifests(self) -> tuple[Image, list[tuple[Platform, Manifest]]]:
+        # Runs on a worker thread, so it must not touch any widgets.
+        if self.digest is None:
+            self.digest = registry_client.resolve_digest(self.repo.name, self.tag)
+        image = self.repo.get_image(self.digest)
+
+        # The menu only needs each platform's manifest. Image configs are left until a
+        # platform is actually opened, and the manifests are fetched side by side rather
+        # than one after another.
+        platforms = list(image.platforms)
+        manifests = platform_fetches.map(image.fetch_manifest_by_platform, platforms)
+        platform_manifests = list(zip(platforms, manifests))
 
         if preferred_platform:
-            pimages = []
-            preferred_pimage = None
-            for pimage in image.get_platform_images():
-                if pimage.config.platform == preferred_platform:
-                    preferred_pimage = pimage
-                else:
-                    pimages.append(pimage)
-            if preferred_pimage:
-                pimages.insert(0, preferred_pimage)
-        else:
-            pimages = image.get_platform_images()
+            platform_manifests.sort(key=lambda pm: pm[0] != preferred_platform)
 
-        choices = [PlatformChoice(pimage) for pimage in pimages]
+        return image, platform_manifests
+
+    def _platform_manifests_loaded(self, generation: int, placeholder, future: Future):
+        if generation != registry_generation:
+            return
+
+        try:
+            image, platform_manifests = future.result()
+        except Exception as e:
+            # Nothing is cached, so opening the tag again retries.
+            if platforms_frame.body is placeholder:
+                platforms_frame.body = make_error_placeholder(e)
+            return
 
-        actual_menu = make_menu(choices)
-        self.menu = weakref.ref(actual_menu)
-        self._open_menu(actual_menu)
+        choices = [
+            PlatformChoice(image, platform, manifest)
+            for platform, manifest in platform_manifests
+        ]
+
+        menu = make_menu(choices)
+        menu_cache[self.menu_cache_key] = menu
+
+        # Only take over the display if nothing else was opened in the meantime.
+        if platforms_frame.body is placeholder:
+            self._open_menu(menu)
 
 
 class RepositoryMenu(urwid.WidgetWrap):
     def __init__(self, repo: Repository):
         super().__init__(
-            MenuButton(repo.repository, cb(self.open_menu))
+            MenuButton(repo.repository, self.open_menu)
         )
         self.repo = repo
-        self.menu = None
-
-    def _open_menu(self, menu):
+        self._placeholder: Optional[urwid.Widget] = None
+        # The menu being filled in while the tags are still loading. It only goes into
+        # menu_cache once every page has arrived.
+        self._menu: Optional[urwid.Widget] = None
+        # Set while the menu is open and waiting for its tags. Prefetches leave it unset,
+        # so they never build a menu or prefetch tags of their own.
+        self._on_page: Optional[Callable[[list[str], int], None]] = None
+        # The tags loaded so far by the fetch in progress.
+        self._tags: list[str] = []
+
+    @property
+    def menu_cache_key(self) -> tuple:
+        return ("repository", self.repo.name)
+
+    def _show(self, body):
         reset_display()
-        tags_frame.body = menu
+        tags_frame.body = body
 
         header: ChangingText = unwrap(tags_frame.header)
         header.change_heading(self.repo.name)
 
+    def _update_footer(self, menu):
         footer: Text = unwrap(tags_frame.footer)
         listbox: IndicativeListBox = unwrap(menu)
         item_count = listbox.body_len()
@@ -305,31 +496,117 @@ class RepositoryMenu(urwid.WidgetWrap):
         else:
             footer.set_text(f"{item_count} tags")
 
+    def _open_menu(self, menu):
+        self._show(menu)
+        self._update_footer(menu)
+
         menus_frame.focus_position = 4
 
-    def open_menu(self):
-        menu = self.menu
+    def open_menu(self, _widget=None):
+        menu = menu_cache.get(self.menu_cache_key)
         if menu:
-            actual_menu = menu()
-            if actual_menu:
-                self._open_menu(actual_menu)
-                return
+            self._open_menu(menu)
+            return
 
-        tags = self.repo.tags()
-        choices = [TagChoice(self.repo, tag) for tag in tags]
+        self._placeholder = make_loading_placeholder()
+        self._show(self._placeholder)
 
-        actual_menu = make_menu(choices)
-        self.menu = weakref.ref(actual_menu)
-        self._open_menu(actual_menu)
+        footer: Text = unwrap(tags_frame.footer)
+        footer.set_text("")
+
+        self._menu = None
+        self._on_page = functools.partial(self._show_tags, registry_generation)
+        future = self._fetch_tags()
+        background.when_done(future, functools.partial(self._tags_loaded, registry_generation))
+
+        # A prefetch may already have loaded some pages before anyone was listening.
+        tags = self._tags
+        if not future.done() and tags:
+            self._show_tags(registry_generation, tags, len(tags))
+
+    def prefetch(self):
+        if self.menu_cache_key not in menu_cache:
+            self._fetch_tags()
+
+    def _fetch_tags(self) -> Future:
+        return fetch(self.menu_cache_key, self._load_tags)
+
+    def _load_tags(self) -> list[str]:
+        # Runs on a worker thread. If the menu is open, each page of tags is handed over
+        # as soon as it arrives, so it can be shown while the rest are still loading. The
+        # main thread only ever reads the part of the list it has been told about.
+        tags: list[str] = []
+        self._tags = tags
+        try:
+            for page in registry_client.iter_repository_tags(self.repo.name):
+                tags.extend(page)
+                on_page = self._on_page
+                if on_page is not None:
+                    background.call_soon(functools.partial(on_page, tags, len(tags)))
+        finally:
+            self._tags = []
+        return tags
+
+    def _tags_loaded(self, generation: int, future: Future):
+        self._on_page = None
+        if generation != registry_generation:
+            self._menu = None
+            return
+        if self.menu_cache_key in menu_cache:
+            # Already shown by an earlier call, from the menu being opened twice.
+            return
+
+        try:
+            tags = future.result()
+        except Exception as e:
+            # Drop any menu holding only the pages that arrived before the failure. Nothing
+            # is cached, so opening the repository again retries.
+            menu, self._menu = self._menu, None
+            if tags_frame.body is self._placeholder or (menu is not None and tags_frame.body is menu):
+                self._placeholder = None
+                tags_frame.body = make_error_placeholder(e)
+                unwrap(tags_frame.footer).set_text("")
+            return
+
+        self._show_tags(generation, tags, len(tags))
+        menu_cache[self.menu_cache_key] = self._menu
+        self._menu = None
+
+    def _show_tags(self, generation: int, tags: list[str], count: int):
+        if generation != registry_generation:
+            return
+
+        menu = self._menu
+        if menu is None:
+            choices = LazyListWalker(count, lambda idx: TagChoice(self.repo, tags[idx]))
+            for idx in range(min(count, PREFETCH_TAG_COUNT)):
+                choices[idx].original_widget.prefetch()
+
+            menu = make_menu(choices)
+            self._menu = menu
+        else:
+            walker: LazyListWalker = unwrap(menu).get_body()
+            if count <= len(walker):
+                return
+            walker.set_length(count)
+
+        if tags_frame.body is menu:
+            self._update_footer(menu)
+        elif self._placeholder is not None and tags_frame.body is self._placeholder:
+            self._placeholder = None
+            self._open_menu(menu)
 
 
 class NamespaceMenu(urwid.WidgetWrap):
     def __init__(self, ns: str):
         super().__init__(
-            MenuButton(ns, cb(self.open_menu))
+            MenuButton(ns, self.open_menu)
         )
         self.ns = ns
-        self.menu = None
+
+    @property
+    def menu_cache_key(self) -> tuple:
+        return ("namespace", self.ns)
 
     def _open_menu(self, menu):
         reset_display()
@@ -349,20 +626,20 @@ class NamespaceMenu(urwid.WidgetWrap):
 
         menus_frame.focus_position = 2
 
-    def open_menu(self):
-        menu = self.menu
+    def open_menu(self, _widget=None):
+        menu = menu_cache.get(self.menu_cache_key)
         if menu:
-            actual_menu = menu()
-            if actual_menu:
-                self._open_menu(actual_menu)
-                return
+            self._open_menu(menu)
+            return
 
-        repositories = dclient.repositories(namespace=self.ns)
-        choices = [RepositoryMenu(repo) for repo in repositories.values()]
+        repositories = list(dclient.repositories(namespace=self.ns).values())
+        choices = LazyListWalker(len(repositories), lambda idx: RepositoryMenu(repositories[idx]))
+        for idx in range(min(len(repositories), PREFETCH_REPOSITORY_COUNT)):
+            choices[idx].original_widget.prefetch()
 
-        actual_menu = make_menu(choices)
-        self.menu = weakref.ref(actual_menu)
-        self._open_menu(actual_menu)
+        menu = make_menu(choices)
+        menu_cache[self.menu_cache_key] = menu
+        self._open_menu(menu)
 
 
 class ChangingText(Text):
@@ -416,47 +693,42 @@ class ResettableFrame(Frame):
 
 class PileMenu(Pile):
     def __init__(self, widget_list):
+        # Menus share the available height equally, with a divider between each of them.
+        contents = []
+        for i, menu in enumerate(widget_list):
+            if i > 0:
+                contents.append((divider, (urwid.PACK, None)))
+            contents.append((AttrMap(menu, "options", focus_map), (urwid.WEIGHT, 1)))
+
         super().__init__([])
+        self.contents[:] = contents
+        self.focus_position = 0
 
-        widget_count = len(widget_list)
-        menu_height = screen_rows // widget_count
-        reduce_height_pool = screen_rows - (widget_count * menu_height) - (widget_count - 1)
 
-        dividers = itertools.repeat(divider, widget_count - 1)
-        for i, (menu, _divider) in enumerate(itertools.zip_longest(widget_list, dividers)):
-            height = menu_height
-            if reduce_height_pool < 0:
-                height -= 1
-                reduce_height_pool += 1
+def pad_text(widget: Text):
+    return urwid.Padding(widget, left=1, right=1)
 
-            self.contents.append((
-                AttrMap(menu, "options", focus_map),
-                (urwid.GIVEN, height),
-            ))
 
-            if _divider:
-                self.contents.append((_divider, (urwid.WEIGHT, 1)))
+def make_loading_placeholder():
+    return Filler(pad_text(Text("Loading\N{HORIZONTAL ELLIPSIS}")), valign=urwid.TOP)
 
-        self.focus_position = 0
 
+def make_error_placeholder(error: Exception):
+    return Filler(pad_text(Text(f"Failed to load: {error}")), valign=urwid.TOP)
 
-def pad_text(widget: Text):
-    return urwid.Padding(widget, left=1, right=1)
 
-
-namespaces = dclient.namespaces()
 namespaces_frame = Frame(
-    make_menu([NamespaceMenu(ns) for ns in namespaces]),
+    make_loading_placeholder(),
     header=AttrMap(
         pad_text(Text("Namespaces")),
         "heading",
     ),
     footer=AttrMap(
-        pad_text(Text([str(len(namespaces)), " namespaces"])),
+        pad_text(Text("")),
         "footer",
     )
 )
-images_frame = Frame(
+images_frame = ResettableFrame(
     make_menu([]),
     header=AttrMap(
         pad_text(ChangingText("Images", "Images: {}")),
@@ -480,7 +752,6 @@ tags_frame = ResettableFrame(
 )
 
 menus_frame = PileMenu([namespaces_frame, images_frame, tags_frame])
-menus_container = Filler(menus_frame, valign=urwid.TOP)
 
 platforms_frame = ResettableFrame(
     SolidFill(),
@@ -500,7 +771,7 @@ display_pile.contents.append((
     layers_frame, Pile.options(urwid.WEIGHT, 1)
 ))
 display_frame = ResettableFrame(
-    Filler(display_pile, height=screen_rows - 1),
+    display_pile,
     header=AttrMap(
         pad_text(ChangingText("", "{}", align=urwid.CENTER)),
         "heading",
@@ -514,22 +785,85 @@ def reset_display():
     display_frame.reset()
 
 
-try:
-    container = Columns([], dividechars=1, focus_column=0)
-    container.contents.append((
-        menus_container,
-        Columns.options(urwid.GIVEN, 36),
-    ))
-    container.contents.append((
-        Filler(
-            AttrMap(display_frame, "options", focus_map),
-            valign=urwid.TOP,
-            height=screen_rows,
-        ),
-        Columns.options(),
-    ))
-
-    loop = urwid.MainLoop(container, palette=palette, screen=screen, handle_mouse=False)
-    loop.run()
-except KeyboardInterrupt:
-    pass
+def show_namespaces(namespaces):
+    choices = LazyListWalker(len(namespaces), lambda idx: NamespaceMenu(namespaces[idx]))
+    namespaces_frame.body = make_menu(choices)
+
+    footer: Text = unwrap(namespaces_frame.footer)
+    footer.set_text(f"{len(namespaces)} namespaces")
+
+
+container = Columns([], dividechars=1, focus_column=0)
+container.contents.append((
+    menus_frame,
+    Columns.options(urwid.GIVEN, 36),
+))
+container.contents.append((
+    AttrMap(display_frame, "options", focus_map),
+    Columns.options(),
+))
+
+
+def refresh_registry():
+    # Forget everything that was listed, so that new repositories and tags (and tags
+    # that have moved) show up. Manifests are addressed by digest and can stay cached.
+    global dclient, registry_generation
+    registry_generation += 1
+    registry_client.clear_listings()
+    dclient = Registry(registry_client)
+    menu_cache.clear()
+    fetches.clear()
+
+    reset_display()
+    tags_frame.reset()
+    images_frame.reset()
+    namespaces_frame.body = make_loading_placeholder()
+    unwrap(namespaces_frame.footer).set_text("")
+    menus_frame.focus_position = 0
+    container.focus_position = 0
+
+    load_namespaces()
+
+
+def load_namespaces():
+    future = background.submit(dclient.refresh)
+    background.when_done(future, functools.partial(namespaces_loaded, dclient, registry_generation))
+
+
+def namespaces_loaded(registry: Registry, generation: int, future: Future):
+    # A refresh in the meantime has already started loading a newer catalogue.
+    if generation != registry_generation:
+        return
+
+    try:
+        future.result()
+    except Exception as e:
+        namespaces_frame.body = make_error_placeholder(e)
+        unwrap(namespaces_frame.footer).set_text("Press r to retry")
+        return
+
+    show_namespaces(registry.namespaces())
+
+
+def handle_input(key):
+    if key == "r":
+        refresh_registry()
+
+
+loop = urwid.MainLoop(container, palette=palette, handle_mouse=False, unhandled_input=handle_input)
+
+
+def main():
+    # Draw the interface straight away, and fill in the namespaces once the catalogue
+    # has loaded.
+    background.attach(loop)
+    load_namespaces()
+
+    try:
+        loop.run()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()